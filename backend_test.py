@@ -5,129 +5,175 @@ Tests all CRUD operations and edge cases for the book management system.
 """
 
 import asyncio
-import httpx
-import json
+import functools
+import sys
+
+import aiohttp
+import orjson
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Any, Optional
 
 # Backend URL from the review request
 BASE_URL = "https://bookfolio.preview.emergentagent.com/api"
+# Every endpoint in this battery hangs off /books; build the prefix once
+BOOKS_URL = f"{BASE_URL}/books"
+
+# Required response fields, as frozensets: the set-difference against
+# data.keys() runs in C instead of a per-field Python membership loop
+_ISBN_FIELDS = frozenset(("title", "author", "totalPages", "isbn"))
+_BOOK_FIELDS = frozenset(("id", "title", "author", "isbn", "totalPages", "currentPage", "status", "progress"))
+
+# Bit per mark-as-finished invariant, with the matching failure message;
+# only consulted when the combined mask says something is wrong
+_FINISHED_ISSUES = (
+    (0b0001, lambda d: f"Status: {d.get('status')} (expected 'read')"),
+    (0b0010, lambda d: f"Progress: {d.get('progress')}% (expected 100%)"),
+    (0b0100, lambda d: f"Pages: {d.get('currentPage', 0)}/{d.get('totalPages', 0)} (should be equal)"),
+    (0b1000, lambda d: "dateFinished not set"),
+)
+
+# Known-good fixture, used when the ISBN search hasn't populated the cache
+DEFAULT_BOOK = {
+    "isbn": "9780439708180",
+    "title": "Harry Potter and the Sorcerer's Stone",
+    "author": "J.K. Rowling",
+    "totalPages": 309,
+}
+
+
+@dataclass(slots=True)
+class TestResult:
+    """One test outcome. Slots give fixed-offset attribute access and about
+    half the memory of the four-key dict this replaces."""
+    test: str
+    status: str
+    success: bool
+    details: str = ""
+    response_data: Any = None
+
+
+def _test(name):
+    """Report any exception escaping a test as a failure of `name`.
+
+    Every test method carried an identical try/except around its body; the
+    decorator keeps failure reporting in one place and lets the happy path
+    run without a per-method handler block.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                return await fn(self, *args, **kwargs)
+            except Exception as e:
+                self.log_test(name, False, f"Exception: {str(e)}")
+        return wrapper
+    return deco
 
 class BookTrackerTester:
     def __init__(self):
         self.base_url = BASE_URL
         self.test_results = []
-        self.created_book_ids = []  # Track created books for cleanup
-        
-    async def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
+        self.created_book_ids = set()  # Track created books for cleanup
+        self._isbn_cache = {}  # Search payloads, reused by test_add_book
+
+    def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
         """Log test results"""
         status = "✅ PASS" if success else "❌ FAIL"
-        result = {
-            "test": test_name,
-            "status": status,
-            "details": details,
-            "response_data": response_data
-        }
-        self.test_results.append(result)
-        print(f"{status} {test_name}")
+        self.test_results.append(
+            TestResult(test_name, status, success, details, response_data)
+        )
+        # One write per result instead of up to four print() calls: fewer
+        # syscalls, and concurrent tests can't interleave a record's lines
+        lines = [f"{status} {test_name}\n"]
         if details:
-            print(f"   Details: {details}")
+            lines.append(f"   Details: {details}\n")
         if not success and response_data:
-            print(f"   Response: {response_data}")
-        print()
+            lines.append(f"   Response: {response_data}\n")
+        lines.append("\n")
+        sys.stdout.write("".join(lines))
+
+    async def _crud_get(self, client: aiohttp.ClientSession, url: str, name: str, *,
+                        expected_status: int = 200, required_fields: frozenset = None,
+                        detail=None):
+        """Shared primitive for the GET-shaped tests.
+
+        Checks the status, optionally the required response fields, and logs
+        the outcome under `name`. `detail` is either a success string or a
+        callable over the parsed payload. Returns the payload on a validated
+        200, else None - so each concrete test is a data row (url, expected
+        status, fields, message) instead of its own 30-line block.
+        """
+        async with client.get(url) as response:
+            if response.status != expected_status:
+                body = await response.text()
+                if expected_status == 200:
+                    msg = f"HTTP {response.status}: {body}"
+                else:
+                    msg = f"Expected {expected_status}, got {response.status}"
+                self.log_test(name, False, msg, body)
+                return None
+            if expected_status != 200:
+                self.log_test(name, True, detail or "")
+                return None
+            data = await response.json(loads=orjson.loads)
+
+        if required_fields:
+            missing_fields = required_fields - data.keys()
+            if missing_fields:
+                self.log_test(name, False, f"Missing required fields: {sorted(missing_fields)}", data)
+                return None
+
+        self.log_test(name, True, detail(data) if callable(detail) else (detail or ""), data)
+        return data
 
-    async def test_isbn_search(self, client: httpx.AsyncClient):
+    @_test("ISBN Search")
+    async def test_isbn_search(self, client: aiohttp.ClientSession):
         """Test ISBN search functionality"""
         print("=== Testing ISBN Search ===")
-        
+
         # Test with Harry Potter ISBN as specified in review request
         isbn = "9780439708180"
-        try:
-            response = await client.get(f"{self.base_url}/books/search/{isbn}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                expected_fields = ["title", "author", "totalPages", "isbn"]
-                missing_fields = [field for field in expected_fields if field not in data]
-                
-                if missing_fields:
-                    await self.log_test(
-                        f"ISBN Search - {isbn}",
-                        False,
-                        f"Missing required fields: {missing_fields}",
-                        data
-                    )
-                else:
-                    await self.log_test(
-                        f"ISBN Search - {isbn}",
-                        True,
-                        f"Found: {data.get('title', 'Unknown')} by {data.get('author', 'Unknown')}",
-                        data
-                    )
-            else:
-                await self.log_test(
-                    f"ISBN Search - {isbn}",
-                    False,
-                    f"HTTP {response.status_code}: {response.text}",
-                    response.text
-                )
-        except Exception as e:
-            await self.log_test(
-                f"ISBN Search - {isbn}",
-                False,
-                f"Exception: {str(e)}"
-            )
+        data = await self._crud_get(
+            client, f"{BOOKS_URL}/search/{isbn}", f"ISBN Search - {isbn}",
+            required_fields=_ISBN_FIELDS,
+            detail=lambda d: f"Found: {d.get('title', 'Unknown')} by {d.get('author', 'Unknown')}",
+        )
+        if data is not None:
+            self._isbn_cache[isbn] = data
 
         # Test with invalid ISBN
-        try:
-            invalid_isbn = "1234567890"
-            response = await client.get(f"{self.base_url}/books/search/{invalid_isbn}")
-            
-            if response.status_code == 404:
-                await self.log_test(
-                    "ISBN Search - Invalid ISBN",
-                    True,
-                    "Correctly returned 404 for invalid ISBN"
-                )
-            else:
-                await self.log_test(
-                    "ISBN Search - Invalid ISBN",
-                    False,
-                    f"Expected 404, got {response.status_code}",
-                    response.text
-                )
-        except Exception as e:
-            await self.log_test(
-                "ISBN Search - Invalid ISBN",
-                False,
-                f"Exception: {str(e)}"
-            )
+        invalid_isbn = "1234567890"
+        await self._crud_get(
+            client, f"{BOOKS_URL}/search/{invalid_isbn}", "ISBN Search - Invalid ISBN",
+            expected_status=404,
+            detail="Correctly returned 404 for invalid ISBN",
+        )
 
-    async def test_add_book(self, client: httpx.AsyncClient) -> Optional[str]:
+    @_test("Add Book")
+    async def test_add_book(self, client: aiohttp.ClientSession) -> Optional[str]:
         """Test adding a new book"""
         print("=== Testing Add Book ===")
-        
+
+        # Reuse metadata the ISBN search already fetched when it's there -
+        # the phases overlap, so fall back to the fixture if not yet cached
+        isbn = "9780439708180"
         book_data = {
-            "isbn": "9780439708180",
-            "title": "Harry Potter and the Sorcerer's Stone",
-            "author": "J.K. Rowling",
-            "totalPages": 309,
+            **self._isbn_cache.get(isbn, DEFAULT_BOOK),
             "currentPage": 0,
             "status": "want_to_read"
         }
-        
-        try:
-            response = await client.post(
-                f"{self.base_url}/books",
-                json=book_data
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
+
+        async with client.post(
+            BOOKS_URL,
+            json=book_data
+        ) as response:
+            if response.status == 200:
+                data = await response.json(loads=orjson.loads)
                 if "id" in data:
                     book_id = data["id"]
-                    self.created_book_ids.append(book_id)
-                    await self.log_test(
+                    self.created_book_ids.add(book_id)
+                    self.log_test(
                         "Add Book",
                         True,
                         f"Book added successfully with ID: {book_id}",
@@ -135,428 +181,356 @@ class BookTrackerTester:
                     )
                     return book_id
                 else:
-                    await self.log_test(
+                    self.log_test(
                         "Add Book",
                         False,
                         "Response missing 'id' field",
                         data
                     )
             else:
-                await self.log_test(
+                body = await response.text()
+                self.log_test(
                     "Add Book",
                     False,
-                    f"HTTP {response.status_code}: {response.text}",
-                    response.text
+                    f"HTTP {response.status}: {body}",
+                    body
                 )
-        except Exception as e:
-            await self.log_test(
-                "Add Book",
-                False,
-                f"Exception: {str(e)}"
-            )
-        
+
         return None
 
-    async def test_get_all_books(self, client: httpx.AsyncClient):
+    @_test("Get All Books")
+    async def test_get_all_books(self, client: aiohttp.ClientSession):
         """Test getting all books"""
         print("=== Testing Get All Books ===")
-        
-        try:
-            response = await client.get(f"{self.base_url}/books")
-            
-            if response.status_code == 200:
-                data = response.json()
+
+        async with client.get(BOOKS_URL) as response:
+            if response.status == 200:
+                data = await response.json(loads=orjson.loads)
                 if isinstance(data, list):
-                    await self.log_test(
+                    # Only the count matters here; drop the parsed list
+                    # right away so a large library isn't held in memory
+                    # (or kept alive in the results record) for the rest
+                    # of the run
+                    count = len(data)
+                    del data
+                    self.log_test(
                         "Get All Books",
                         True,
-                        f"Retrieved {len(data)} books",
-                        f"Count: {len(data)}"
+                        f"Retrieved {count} books",
+                        f"Count: {count}"
                     )
                 else:
-                    await self.log_test(
+                    self.log_test(
                         "Get All Books",
                         False,
                         "Response is not a list",
                         data
                     )
             else:
-                await self.log_test(
+                body = await response.text()
+                self.log_test(
                     "Get All Books",
                     False,
-                    f"HTTP {response.status_code}: {response.text}",
-                    response.text
+                    f"HTTP {response.status}: {body}",
+                    body
                 )
-        except Exception as e:
-            await self.log_test(
-                "Get All Books",
-                False,
-                f"Exception: {str(e)}"
-            )
 
-    async def test_get_single_book(self, client: httpx.AsyncClient, book_id: str):
+    @_test("Get Single Book")
+    async def test_get_single_book(self, client: aiohttp.ClientSession, book_id: str):
         """Test getting a single book by ID"""
         print("=== Testing Get Single Book ===")
-        
-        try:
-            response = await client.get(f"{self.base_url}/books/{book_id}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                required_fields = ["id", "title", "author", "isbn", "totalPages", "currentPage", "status", "progress"]
-                missing_fields = [field for field in required_fields if field not in data]
-                
-                if missing_fields:
-                    await self.log_test(
-                        "Get Single Book",
-                        False,
-                        f"Missing required fields: {missing_fields}",
-                        data
-                    )
-                else:
-                    await self.log_test(
-                        "Get Single Book",
-                        True,
-                        f"Retrieved book: {data.get('title', 'Unknown')}",
-                        data
-                    )
-            else:
-                await self.log_test(
-                    "Get Single Book",
-                    False,
-                    f"HTTP {response.status_code}: {response.text}",
-                    response.text
-                )
-        except Exception as e:
-            await self.log_test(
-                "Get Single Book",
-                False,
-                f"Exception: {str(e)}"
-            )
+
+        await self._crud_get(
+            client, f"{BOOKS_URL}/{book_id}", "Get Single Book",
+            required_fields=_BOOK_FIELDS,
+            detail=lambda d: f"Retrieved book: {d.get('title', 'Unknown')}",
+        )
 
         # Test with invalid book ID
-        try:
-            invalid_id = "invalid_book_id_123"
-            response = await client.get(f"{self.base_url}/books/{invalid_id}")
-            
-            if response.status_code == 400:
-                await self.log_test(
-                    "Get Single Book - Invalid ID",
-                    True,
-                    "Correctly returned 400 for invalid book ID"
-                )
-            else:
-                await self.log_test(
-                    "Get Single Book - Invalid ID",
-                    False,
-                    f"Expected 400, got {response.status_code}",
-                    response.text
-                )
-        except Exception as e:
-            await self.log_test(
-                "Get Single Book - Invalid ID",
-                False,
-                f"Exception: {str(e)}"
-            )
+        invalid_id = "invalid_book_id_123"
+        await self._crud_get(
+            client, f"{BOOKS_URL}/{invalid_id}", "Get Single Book - Invalid ID",
+            expected_status=400,
+            detail="Correctly returned 400 for invalid book ID",
+        )
 
-    async def test_get_books_by_status(self, client: httpx.AsyncClient):
+    @_test("Get Books by Status")
+    async def test_get_books_by_status(self, client: aiohttp.ClientSession):
         """Test getting books by status"""
         print("=== Testing Get Books by Status ===")
-        
+
         statuses = ["want_to_read", "currently_reading", "read"]
-        
-        for status in statuses:
+
+        async def _one(status: str):
             try:
-                response = await client.get(f"{self.base_url}/books/status/{status}")
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if isinstance(data, list):
-                        await self.log_test(
-                            f"Get Books by Status - {status}",
-                            True,
-                            f"Retrieved {len(data)} books with status '{status}'",
-                            f"Count: {len(data)}"
-                        )
+                async with client.get(f"{BOOKS_URL}/status/{status}") as response:
+                    if response.status == 200:
+                        data = await response.json(loads=orjson.loads)
+                        if isinstance(data, list):
+                            self.log_test(
+                                f"Get Books by Status - {status}",
+                                True,
+                                f"Retrieved {len(data)} books with status '{status}'",
+                                f"Count: {len(data)}"
+                            )
+                        else:
+                            self.log_test(
+                                f"Get Books by Status - {status}",
+                                False,
+                                "Response is not a list",
+                                data
+                            )
                     else:
-                        await self.log_test(
+                        body = await response.text()
+                        self.log_test(
                             f"Get Books by Status - {status}",
                             False,
-                            "Response is not a list",
-                            data
+                            f"HTTP {response.status}: {body}",
+                            body
                         )
-                else:
-                    await self.log_test(
-                        f"Get Books by Status - {status}",
-                        False,
-                        f"HTTP {response.status_code}: {response.text}",
-                        response.text
-                    )
             except Exception as e:
-                await self.log_test(
+                self.log_test(
                     f"Get Books by Status - {status}",
                     False,
                     f"Exception: {str(e)}"
                 )
 
-    async def test_update_book_progress(self, client: httpx.AsyncClient, book_id: str):
-        """Test updating book progress"""
+        # The three status reads are independent; overlap their round trips
+        await asyncio.gather(*[_one(status) for status in statuses])
+
+    async def _put_book(self, client: aiohttp.ClientSession, book_id: str, patch: dict):
+        """Issue a book PUT and fully read the response.
+
+        Returns (status, payload): parsed JSON on 200, raw text otherwise.
+        The update tests validate these tuples, which lets run_all_tests
+        overlap one PUT's round trip with the previous one's validation.
+        """
+        async with client.put(f"{BOOKS_URL}/{book_id}", json=patch) as response:
+            if response.status == 200:
+                return response.status, await response.json(loads=orjson.loads)
+            return response.status, await response.text()
+
+    @_test("Update Book Progress")
+    async def test_update_book_progress(self, status: int, payload):
+        """Validate the currentPage-update response"""
         print("=== Testing Update Book Progress ===")
-        
-        # Test updating current page
-        update_data = {"currentPage": 50}
-        
-        try:
-            response = await client.put(
-                f"{self.base_url}/books/{book_id}",
-                json=update_data
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("currentPage") == 50:
-                    # Check if progress was calculated correctly
-                    expected_progress = (50 / data.get("totalPages", 1)) * 100
-                    actual_progress = data.get("progress", 0)
-                    
-                    if abs(actual_progress - expected_progress) < 0.1:  # Allow small floating point differences
-                        await self.log_test(
-                            "Update Book Progress",
-                            True,
-                            f"Progress updated correctly: {actual_progress:.1f}%",
-                            data
-                        )
-                    else:
-                        await self.log_test(
-                            "Update Book Progress",
-                            False,
-                            f"Progress calculation incorrect. Expected: {expected_progress:.1f}%, Got: {actual_progress:.1f}%",
-                            data
-                        )
+
+        if status == 200:
+            data = payload
+            if data.get("currentPage") == 50:
+                # Check if progress was calculated correctly
+                expected_progress = (50 / data.get("totalPages", 1)) * 100
+                actual_progress = data.get("progress", 0)
+
+                if abs(actual_progress - expected_progress) < 0.1:  # Allow small floating point differences
+                    self.log_test(
+                        "Update Book Progress",
+                        True,
+                        f"Progress updated correctly: {actual_progress:.1f}%",
+                        data
+                    )
                 else:
-                    await self.log_test(
+                    self.log_test(
                         "Update Book Progress",
                         False,
-                        f"Current page not updated correctly. Expected: 50, Got: {data.get('currentPage')}",
+                        f"Progress calculation incorrect. Expected: {expected_progress:.1f}%, Got: {actual_progress:.1f}%",
                         data
                     )
             else:
-                await self.log_test(
+                self.log_test(
                     "Update Book Progress",
                     False,
-                    f"HTTP {response.status_code}: {response.text}",
-                    response.text
+                    f"Current page not updated correctly. Expected: 50, Got: {data.get('currentPage')}",
+                    data
                 )
-        except Exception as e:
-            await self.log_test(
+        else:
+            self.log_test(
                 "Update Book Progress",
                 False,
-                f"Exception: {str(e)}"
+                f"HTTP {status}: {payload}",
+                payload
             )
 
-    async def test_update_book_status(self, client: httpx.AsyncClient, book_id: str):
-        """Test updating book status"""
+    @_test("Update Book Status - Currently Reading")
+    async def test_update_book_status(self, status: int, payload):
+        """Validate the status-update response"""
         print("=== Testing Update Book Status ===")
-        
-        # Test changing status to currently_reading
-        update_data = {"status": "currently_reading"}
-        
-        try:
-            response = await client.put(
-                f"{self.base_url}/books/{book_id}",
-                json=update_data
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("status") == "currently_reading":
-                    await self.log_test(
-                        "Update Book Status - Currently Reading",
-                        True,
-                        "Status updated to 'currently_reading'",
-                        data
-                    )
-                else:
-                    await self.log_test(
-                        "Update Book Status - Currently Reading",
-                        False,
-                        f"Status not updated correctly. Expected: 'currently_reading', Got: {data.get('status')}",
-                        data
-                    )
+
+        if status == 200:
+            data = payload
+            if data.get("status") == "currently_reading":
+                self.log_test(
+                    "Update Book Status - Currently Reading",
+                    True,
+                    "Status updated to 'currently_reading'",
+                    data
+                )
             else:
-                await self.log_test(
+                self.log_test(
                     "Update Book Status - Currently Reading",
                     False,
-                    f"HTTP {response.status_code}: {response.text}",
-                    response.text
+                    f"Status not updated correctly. Expected: 'currently_reading', Got: {data.get('status')}",
+                    data
                 )
-        except Exception as e:
-            await self.log_test(
+        else:
+            self.log_test(
                 "Update Book Status - Currently Reading",
                 False,
-                f"Exception: {str(e)}"
+                f"HTTP {status}: {payload}",
+                payload
             )
 
-    async def test_mark_book_finished(self, client: httpx.AsyncClient, book_id: str):
-        """Test marking a book as finished"""
+    @_test("Mark Book as Finished")
+    async def test_mark_book_finished(self, status: int, payload):
+        """Validate the mark-as-read response"""
         print("=== Testing Mark Book as Finished ===")
-        
-        update_data = {"status": "read"}
-        
-        try:
-            response = await client.put(
-                f"{self.base_url}/books/{book_id}",
-                json=update_data
+
+        if status == 200:
+            data = payload
+
+            current_page = data.get("currentPage", 0)
+            total_pages = data.get("totalPages", 0)
+
+            # One bit per invariant - status is 'read', progress is 100%,
+            # currentPage == totalPages, dateFinished set - so the happy
+            # path is a single compare against the full mask
+            mask = (
+                (data.get("status") == "read")
+                | ((data.get("progress") == 100) << 1)
+                | ((current_page == total_pages) << 2)
+                | ((data.get("dateFinished") is not None) << 3)
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check if status is 'read'
-                status_correct = data.get("status") == "read"
-                
-                # Check if progress is 100%
-                progress_correct = data.get("progress") == 100
-                
-                # Check if currentPage equals totalPages
-                current_page = data.get("currentPage", 0)
-                total_pages = data.get("totalPages", 0)
-                pages_correct = current_page == total_pages
-                
-                # Check if dateFinished is set
-                date_finished_set = data.get("dateFinished") is not None
-                
-                if status_correct and progress_correct and pages_correct and date_finished_set:
-                    await self.log_test(
-                        "Mark Book as Finished",
-                        True,
-                        f"Book marked as finished correctly. Progress: {data.get('progress')}%, Pages: {current_page}/{total_pages}",
-                        data
-                    )
-                else:
-                    issues = []
-                    if not status_correct:
-                        issues.append(f"Status: {data.get('status')} (expected 'read')")
-                    if not progress_correct:
-                        issues.append(f"Progress: {data.get('progress')}% (expected 100%)")
-                    if not pages_correct:
-                        issues.append(f"Pages: {current_page}/{total_pages} (should be equal)")
-                    if not date_finished_set:
-                        issues.append("dateFinished not set")
-                    
-                    await self.log_test(
-                        "Mark Book as Finished",
-                        False,
-                        f"Issues found: {', '.join(issues)}",
-                        data
-                    )
+
+            if mask == 0b1111:
+                self.log_test(
+                    "Mark Book as Finished",
+                    True,
+                    f"Book marked as finished correctly. Progress: {data.get('progress')}%, Pages: {current_page}/{total_pages}",
+                    data
+                )
             else:
-                await self.log_test(
+                issues = [msg(data) for bit, msg in _FINISHED_ISSUES if not mask & bit]
+                self.log_test(
                     "Mark Book as Finished",
                     False,
-                    f"HTTP {response.status_code}: {response.text}",
-                    response.text
+                    f"Issues found: {', '.join(issues)}",
+                    data
                 )
-        except Exception as e:
-            await self.log_test(
+        else:
+            self.log_test(
                 "Mark Book as Finished",
                 False,
-                f"Exception: {str(e)}"
+                f"HTTP {status}: {payload}",
+                payload
             )
 
-    async def test_delete_book(self, client: httpx.AsyncClient, book_id: str):
+    @_test("Delete Book")
+    async def test_delete_book(self, client: aiohttp.ClientSession, book_id: str):
         """Test deleting a book"""
         print("=== Testing Delete Book ===")
-        
-        try:
-            response = await client.delete(f"{self.base_url}/books/{book_id}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "message" in data:
-                    await self.log_test(
-                        "Delete Book",
-                        True,
-                        f"Book deleted successfully: {data.get('message')}",
-                        data
-                    )
-                    
-                    # Remove from our tracking list
-                    if book_id in self.created_book_ids:
-                        self.created_book_ids.remove(book_id)
-                        
-                    # Verify book is actually deleted
-                    verify_response = await client.get(f"{self.base_url}/books/{book_id}")
-                    if verify_response.status_code == 404:
-                        await self.log_test(
-                            "Delete Book - Verification",
-                            True,
-                            "Book successfully removed from database"
-                        )
-                    else:
-                        await self.log_test(
-                            "Delete Book - Verification",
-                            False,
-                            f"Book still exists after deletion. Status: {verify_response.status_code}",
-                            verify_response.text
-                        )
-                else:
-                    await self.log_test(
-                        "Delete Book",
-                        False,
-                        "Response missing 'message' field",
-                        data
-                    )
-            else:
-                await self.log_test(
+
+        async def _verify():
+            async with client.get(f"{BOOKS_URL}/{book_id}") as verify_response:
+                return verify_response.status, await verify_response.text()
+
+        async with client.delete(f"{BOOKS_URL}/{book_id}") as response:
+            if response.status != 200:
+                body = await response.text()
+                self.log_test(
                     "Delete Book",
                     False,
-                    f"HTTP {response.status_code}: {response.text}",
-                    response.text
+                    f"HTTP {response.status}: {body}",
+                    body
+                )
+                return
+            # The delete succeeded at the HTTP level, so kick off the
+            # verification GET now - its round trip overlaps with decoding
+            # and logging the delete body below
+            verify_task = asyncio.create_task(_verify())
+            data = await response.json(loads=orjson.loads)
+
+        if "message" in data:
+            self.log_test(
+                "Delete Book",
+                True,
+                f"Book deleted successfully: {data.get('message')}",
+                data
+            )
+
+            # Remove from our tracking set
+            self.created_book_ids.discard(book_id)
+
+            # Verify book is actually deleted
+            verify_status, verify_body = await verify_task
+            if verify_status == 404:
+                self.log_test(
+                    "Delete Book - Verification",
+                    True,
+                    "Book successfully removed from database"
+                )
+            else:
+                self.log_test(
+                    "Delete Book - Verification",
+                    False,
+                    f"Book still exists after deletion. Status: {verify_status}",
+                    verify_body
                 )
-        except Exception as e:
-            await self.log_test(
+        else:
+            verify_task.cancel()
+            self.log_test(
                 "Delete Book",
                 False,
-                f"Exception: {str(e)}"
+                "Response missing 'message' field",
+                data
             )
 
-    async def cleanup_created_books(self, client: httpx.AsyncClient):
+    async def cleanup_created_books(self, client: aiohttp.ClientSession):
         """Clean up any books created during testing"""
         print("=== Cleaning Up Test Data ===")
-        
-        for book_id in self.created_book_ids[:]:  # Copy list to avoid modification during iteration
-            try:
-                response = await client.delete(f"{self.base_url}/books/{book_id}")
-                if response.status_code == 200:
-                    print(f"✅ Cleaned up book ID: {book_id}")
-                    self.created_book_ids.remove(book_id)
-                else:
-                    print(f"⚠️  Failed to clean up book ID: {book_id} - Status: {response.status_code}")
-            except Exception as e:
-                print(f"⚠️  Error cleaning up book ID: {book_id} - {str(e)}")
+
+        async def _delete(book_id: str) -> int:
+            async with client.delete(f"{BOOKS_URL}/{book_id}") as response:
+                return response.status
+
+        # All leftover books are independent, so the DELETEs fan out
+        # together - one round trip of wall time instead of one per book
+        book_ids = list(self.created_book_ids)  # Snapshot to avoid modification during iteration
+        results = await asyncio.gather(
+            *[_delete(book_id) for book_id in book_ids],
+            return_exceptions=True
+        )
+        for book_id, result in zip(book_ids, results):
+            if isinstance(result, Exception):
+                print(f"⚠️  Error cleaning up book ID: {book_id} - {str(result)}")
+            elif result == 200:
+                print(f"✅ Cleaned up book ID: {book_id}")
+                self.created_book_ids.discard(book_id)
+            else:
+                print(f"⚠️  Failed to clean up book ID: {book_id} - Status: {result}")
 
     def print_summary(self):
         """Print test summary"""
         print("\n" + "="*60)
         print("TEST SUMMARY")
         print("="*60)
-        
+
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if "✅ PASS" in result["status"])
+        # The boolean is stored alongside the display string, so counting
+        # doesn't substring-scan the status text
+        passed_tests = sum(1 for result in self.test_results if result.success)
         failed_tests = total_tests - passed_tests
-        
+
         print(f"Total Tests: {total_tests}")
         print(f"Passed: {passed_tests}")
         print(f"Failed: {failed_tests}")
         print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
+
         if failed_tests > 0:
             print("\nFAILED TESTS:")
             for result in self.test_results:
-                if "❌ FAIL" in result["status"]:
-                    print(f"  - {result['test']}: {result['details']}")
-        
+                if not result.success:
+                    print(f"  - {result.test}: {result.details}")
+
         print("\n" + "="*60)
 
     async def run_all_tests(self):
@@ -564,40 +538,77 @@ class BookTrackerTester:
         print("Starting MyReads Book Tracker Backend API Tests")
         print(f"Backend URL: {self.base_url}")
         print("="*60)
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
+
+        # One long-lived session: the TCP+TLS connection pool is shared by
+        # every test, including the gathered phases
+        timeout = aiohttp.ClientTimeout(total=30)
+        connector = aiohttp.TCPConnector(limit=50, keepalive_timeout=60)
+        async with aiohttp.ClientSession(
+            timeout=timeout,
+            connector=connector,
+            # orjson on both directions: request bodies via json_serialize,
+            # response parsing via the loads= argument at each call site
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
+        ) as client:
+            # Warm up the pool: pay DNS + TCP + TLS once here instead of
+            # inside the first timed test. Any response (even a 404) leaves
+            # an established connection behind; failures just mean the first
+            # real request connects itself.
             try:
-                # Test ISBN search first
-                await self.test_isbn_search(client)
-                
-                # Test adding a book
-                book_id = await self.test_add_book(client)
-                
-                # Test getting all books
-                await self.test_get_all_books(client)
-                
+                async with client.get(f"{self.base_url}/", timeout=aiohttp.ClientTimeout(total=5)):
+                    pass
+            except Exception:
+                pass
+
+            try:
+                # Phase 1: these tests don't depend on each other, so their
+                # round trips overlap on the shared connection pool. gather
+                # returns results in argument order, so book_id still comes
+                # from test_add_book.
+                _, book_id, _ = await asyncio.gather(
+                    self.test_isbn_search(client),
+                    self.test_add_book(client),
+                    self.test_get_all_books(client),
+                )
+
                 # If we successfully created a book, test other operations
                 if book_id:
-                    await self.test_get_single_book(client, book_id)
-                    await self.test_get_books_by_status(client)
-                    await self.test_update_book_progress(client, book_id)
-                    await self.test_update_book_status(client, book_id)
-                    await self.test_mark_book_finished(client, book_id)
+                    # Phase 2: read-only tests that just need the book to exist
+                    await asyncio.gather(
+                        self.test_get_single_book(client, book_id),
+                        self.test_get_books_by_status(client),
+                    )
+                    # The update chain mutates the same book, so the PUTs
+                    # stay ordered: each one is issued only after the
+                    # previous response has arrived. But validation of
+                    # response N runs while PUT N+1 is already in flight,
+                    # hiding the JSON-decode + logging behind the round trip.
+                    r1 = await self._put_book(client, book_id, {"currentPage": 50})
+                    t2 = asyncio.create_task(
+                        self._put_book(client, book_id, {"status": "currently_reading"})
+                    )
+                    await self.test_update_book_progress(*r1)
+                    r2 = await t2
+                    t3 = asyncio.create_task(
+                        self._put_book(client, book_id, {"status": "read"})
+                    )
+                    await self.test_update_book_status(*r2)
+                    await self.test_mark_book_finished(*(await t3))
                     await self.test_delete_book(client, book_id)
                 else:
                     print("⚠️  Skipping dependent tests due to book creation failure")
-                
+
                 # Clean up any remaining test data
                 await self.cleanup_created_books(client)
-                
+
             except Exception as e:
                 print(f"❌ Critical error during testing: {str(e)}")
-                await self.log_test(
+                self.log_test(
                     "Critical Error",
                     False,
                     f"Unexpected error: {str(e)}"
                 )
-            
+
             finally:
                 self.print_summary()
 
@@ -607,4 +618,11 @@ async def main():
     await tester.run_all_tests()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Same optional speedup as the server: uvloop's C event loop shaves
+    # per-await overhead off every request in the battery
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())